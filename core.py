@@ -1,35 +1,217 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
-import hashlib, json, time, os
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
+from typing import Dict, Any, Deque, Mapping, Optional, List, Sequence, Set, Tuple
+from types import MappingProxyType
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import base64, contextlib, errno, hashlib, itertools, json, mmap, time, os
 
-def sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
+def sha256_hex(data: str | bytes) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def sha256_digest(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).digest()
+
+# Snapshot layout version, emitted as "format".
+# 2: ddna_sha256 is the raw 32-byte digest (msgpack bin; base64 in JSON) and ts
+#    (oae.py: timestamp) is integer epoch nanoseconds (1: JSON only, hex string
+#    and float seconds, no "format" key).
+CHECKPOINT_FORMAT = 2
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Compact UTF-8 JSON for snapshots. Always stdlib json, so the bytes (and
+    hence digest and file name) never depend on which optional packages are
+    installed; NaN/Infinity are rejected with ValueError rather than written.
+    """
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False,
+                      allow_nan=False).encode("utf-8")
+
+try:
+    import msgpack
+except ImportError:  # optional: checkpoint() needs it, checkpoint_json() does not
+    msgpack = None
+
+# Shared pool for checkpoint_async(): file writes run here so that callers
+# snapshotting many Sokens are not serialized on per-write latency.
+_CKPT_WRITER = ThreadPoolExecutor(max_workers=4, thread_name_prefix="oae-ckpt")
+
+# hashlib drops the GIL for inputs over 2 KiB, so independent digests scale
+# across cores. Below these sizes the thread hand-off costs more than it saves.
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="oae-hash")
+_HASH_BATCH_MIN = 8
+_HASH_BATCH_MIN_BYTES = 1 << 20
+
+_WRITE_CHUNK = 1 << 20
+_TMP_SEQ = itertools.count()
+
+# Snapshots from this size on are written with O_DIRECT (where the OS has it)
+# so large fleet dumps do not churn the page cache.
+_O_DIRECT = getattr(os, "O_DIRECT", 0)
+_DIRECT_MIN_BYTES = 64 * 1024
+_DIRECT_ALIGN = 4096
+
+def _write_direct(path: str, parts: Sequence[bytes], h: Any) -> bool:
+    """
+    Create path with O_DIRECT and write parts from a page-aligned buffer,
+    padded to the block size and truncated back afterwards, then feed them
+    to h once they are on disk. Returns False, leaving no file and h
+    untouched, if the filesystem does not support O_DIRECT; on any other
+    error the file is left for the caller to remove.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_DIRECT, 0o666)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return False
+    total = sum(map(len, parts))
+    size = -(-total // _DIRECT_ALIGN) * _DIRECT_ALIGN
+    try:
+        try:
+            with mmap.mmap(-1, size) as buf:
+                for part in parts:
+                    buf.write(part)
+                with memoryview(buf) as mv:
+                    written = 0
+                    while written < size:
+                        written += os.pwrite(fd, mv[written:], written)
+                    os.ftruncate(fd, total)
+                    h.update(mv[:total])
+        finally:
+            os.close(fd)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        os.unlink(path)
+        return False
+    return True
+
+def _write_snapshot(directory: str, stem: str, digest_len: int, ext: str, parts: Sequence[bytes]) -> str:
+    """
+    Hash and write snapshot bytes in a single pass, chunk by chunk, into a temp
+    file, then atomically rename it to ``{stem}_{digest[:digest_len]}{ext}``.
+    Returns the final path.
+    """
+    h = hashlib.sha256()
+    tmp = os.path.join(directory, f".{stem}.{os.getpid()}.{next(_TMP_SEQ)}.tmp")
+    try:
+        if not (_O_DIRECT and sum(map(len, parts)) >= _DIRECT_MIN_BYTES and _write_direct(tmp, parts, h)):
+            with open(tmp, "xb") as f:
+                for part in parts:
+                    with memoryview(part) as mv:
+                        for i in range(0, len(mv), _WRITE_CHUNK):
+                            chunk = mv[i:i + _WRITE_CHUNK]
+                            h.update(chunk)
+                            f.write(chunk)
+        path = os.path.join(directory, f"{stem}_{h.hexdigest()[:digest_len]}{ext}")
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+    return path
 
 @dataclass
 class OAEParams:
     memory_decay: float = 0.55      
     entropy_guard: float = 0.62     
     learn_rate: float = 0.08        
+    recovery_rate: float = 0.20     
 
-@dataclass
+class SchemaKind(IntEnum):
+    """Organ category that engines dispatch resonance handlers on."""
+    OTHER = 0
+    MOTOR = 1
+    COGNITIVE = 2
+
+@dataclass(slots=True)
 class DigitalOrgan:
     organ_id: str
-    state_uri: Optional[str] = None   
-    state_hash: Optional[str] = None  
     schema: str = "generic_v1"
     volatile: bool = False
 
+    strength: float = 10.0
+    fatigue: float = 0.0
+    integrity: float = 100.0
+
+    state_uri: Optional[str] = None   
+    state_hash: Optional[str] = None  
+
+    # Derived from schema once at construction; resonance() dispatches on it
+    schema_kind: SchemaKind = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if "motor" in self.schema:
+            self.schema_kind = SchemaKind.MOTOR
+        elif "cognitive" in self.schema:
+            self.schema_kind = SchemaKind.COGNITIVE
+        else:
+            self.schema_kind = SchemaKind.OTHER
+
+    @property
+    def properties(self) -> Mapping[str, float]:
+        """
+        Read-only snapshot of strength/fatigue/integrity (snapshots, display).
+        Writes must go to the attributes; item assignment raises TypeError.
+        """
+        return MappingProxyType({
+            "strength": self.strength,
+            "fatigue": self.fatigue,
+            "integrity": self.integrity
+        })
+
+@dataclass(slots=True)
+class SokenMeta:
+    """Mutable engine state carried by a Soken."""
+    effective_learn_rate: Optional[float] = None   # None: start from OAEParams.learn_rate
+    affect_level: float = 0.0
+    hot_organ: Optional[str] = None
+    hot_organ_at: int = 0                          # time.time_ns(): persisted
+    last_active_organ: Optional[str] = None
+    last_active_ts: int = 0                        # time.time_ns(): persisted
+    checkpoint_dir: Optional[str] = None           # None: the engine's default
+
 @dataclass
 class Soken:
     did: str
-    ddna_sha256: str
+    ddna_sha256: bytes              # raw 32-byte digest
     non_fungible: bool = True
     unique_identity: bool = True
     transferable: bool = True
     merge_policy: str = "oae-consensus"
     digital_organs: Dict[str, DigitalOrgan] = field(default_factory=dict)
-    meta: Dict[str, Any] = field(default_factory=dict)
+    meta: SokenMeta = field(default_factory=SokenMeta)
+
+    def __post_init__(self):
+        if isinstance(self.ddna_sha256, str):
+            # Legacy (format 1) hex digest
+            self.ddna_sha256 = bytes.fromhex(self.ddna_sha256)
+        elif not isinstance(self.ddna_sha256, bytes):
+            raise TypeError(f"ddna_sha256 must be bytes, not {type(self.ddna_sha256).__name__}")
+        if len(self.ddna_sha256) != 32:
+            raise ValueError(f"ddna_sha256 must be a 32-byte SHA-256 digest, got {len(self.ddna_sha256)} bytes")
+        if isinstance(self.meta, dict):
+            self.meta = SokenMeta(**self.meta)
+
+    def meta_dict(self) -> Dict[str, Any]:
+        """
+        Plain-dict copy of meta, for checkpoint serialization.
+        """
+        return asdict(self.meta)
+
+@dataclass(slots=True)
+class ResonanceContext:
+    """Typed resonance() input; fields are trusted as-is (no float() coercion)."""
+    intensity: float = 0.5
+    alignment: float = 0.5
+    organ_id: Optional[str] = None
+    action: Optional[str] = None
 
 class OAE:
     """
@@ -40,26 +222,74 @@ class OAE:
     def __init__(self, soken: Soken, params: OAEParams):
         self.soken = soken
         self.params = params
-        self._checkpoint_dir = self.soken.meta.get("checkpoint_dir", "./oae_ckpt")
+        self._checkpoint_dir = self.soken.meta.checkpoint_dir or "./oae_ckpt"
+        self._ckpt_dir_ready = False
+        self._pending: Set[Future] = set()
+        # First checkpoint_async() write error not yet raised by flush_checkpoints()
+        self._ckpt_error: Optional[BaseException] = None
+        # Reusable msgpack.Packer buffers (autoreset=False); one is leased per
+        # binary checkpoint and handed back once its write has landed.
+        self._bufpool: Deque[Any] = deque(maxlen=4)
+        # Identity and policy rarely change, so their JSON is rendered once and
+        # spliced in front of the rest; _static_parts() re-renders on change.
+        self._static_key: Optional[Tuple[Any, ...]] = None
+        self._static_fields: Dict[str, Any] = {}
+        self._static_prefix = b""
+
+    def _static_parts(self) -> Tuple[Dict[str, Any], bytes]:
+        """
+        Identity/policy checkpoint fields and their rendered JSON prefix,
+        re-rendered whenever one of the Soken fields behind them has changed.
+        """
+        s = self.soken
+        key = (s.did, s.ddna_sha256, s.non_fungible, s.unique_identity,
+               s.transferable, s.merge_policy)
+        if key != self._static_key:
+            self._static_fields = {
+                "format": CHECKPOINT_FORMAT,
+                "did": s.did,
+                "ddna_sha256": s.ddna_sha256,
+                "policy": {
+                    "non_fungible": s.non_fungible,
+                    "unique_identity": s.unique_identity,
+                    "transferable": s.transferable,
+                    "merge_policy": s.merge_policy,
+                },
+            }
+            static = _dumps({
+                **self._static_fields,
+                "ddna_sha256": base64.b64encode(s.ddna_sha256).decode("ascii"),
+            })
+            self._static_prefix = static[:-1] + b","
+            self._static_key = key
+        return self._static_fields, self._static_prefix
 
-    def resonance(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def resonance(self, context: ResonanceContext | Dict[str, Any]) -> Dict[str, Any]:
         """
         Apply a high-energy event (empathic/intent exchange).
         Returns an effect dict describing adjustments.
         """
-        inten = float(context.get("intensity", 0.5))       
-        align = float(context.get("alignment", 0.5))       
+        if isinstance(context, ResonanceContext):
+            inten = context.intensity
+            align = context.alignment
+            target_organ = context.organ_id
+        else:
+            inten = float(context.get("intensity", 0.5))       
+            align = float(context.get("alignment", 0.5))       
+            target_organ = context.get("organ_id")
         
         effective = inten * align * (1.0 - self.params.entropy_guard * 0.6)
        
-        prev_lr = float(self.soken.meta.get("effective_learn_rate", self.params.learn_rate))
+        meta = self.soken.meta
+        prev_lr = meta.effective_learn_rate
+        if prev_lr is None:
+            prev_lr = self.params.learn_rate
         new_lr = max(0.0, min(1.0, prev_lr + effective * 0.05))
-        self.soken.meta["effective_learn_rate"] = new_lr
+        meta.effective_learn_rate = new_lr
 
-        target_organ = context.get("organ_id")
         if target_organ and target_organ in self.soken.digital_organs:
-            self.soken.meta["hot_organ"] = target_organ
-            self.soken.meta["hot_organ_at"] = time.time()
+            meta.hot_organ = target_organ
+            meta.hot_organ_at = time.time_ns()
 
         return {
             "effective_impact": effective,
@@ -69,16 +299,17 @@ class OAE:
             "target_organ": target_organ,
         }
 
-    def decay_tick(self, now: Optional[float] = None) -> Dict[str, Any]:
+    def decay_tick(self, now: Optional[int] = None) -> Dict[str, Any]:
         """
         Enact memory decay and stabilize volatile organs.
         Call this periodically (e.g., per session/hour/day).
+        `now` is a time.time_ns() stamp, comparable with the meta timestamps.
         """
-        now = now or time.time()
+        now = now or time.time_ns()
         decay = self.params.memory_decay      
-        emo = float(self.soken.meta.get("affect_level", 0.0))
+        emo = self.soken.meta.affect_level
         new_emo = emo * (1.0 - 0.5 * decay)  
-        self.soken.meta["affect_level"] = new_emo
+        self.soken.meta.affect_level = new_emo
 
         cooled = []
         for oid, organ in self.soken.digital_organs.items():
@@ -89,18 +320,85 @@ class OAE:
     def checkpoint(self, label: str) -> str:
         """
         Create a tamper-evident snapshot (metadata-only; organ payload stays off-chain).
+        Always written as .msgpack; raises ImportError if msgpack is not
+        installed (checkpoint_json() is the portable layout).
         Returns checkpoint file path.
         """
-        os.makedirs(self._checkpoint_dir, exist_ok=True)
+        return self._checkpoint_result(self.checkpoint_async(label))
+
+    def checkpoint_json(self, label: str) -> str:
+        """
+        checkpoint() in the JSON layout; needs no optional packages.
+        """
+        return self._checkpoint_result(self.checkpoint_async(label, binary=False))
+
+    def _checkpoint_result(self, fut: Future) -> str:
+        """
+        Wait for fut; its error is raised here, so flush_checkpoints() must not
+        raise it again.
+        """
+        try:
+            return fut.result()
+        except BaseException as e:
+            if self._ckpt_error is e:
+                self._ckpt_error = None
+            raise
+
+    def checkpoint_async(self, label: str, binary: bool = True) -> Future:
+        """
+        Same snapshot as checkpoint(), but the file write is handed to the
+        shared writer pool. Returns a Future resolving to the file path.
+        binary selects msgpack (True, the default) or JSON (False).
+        """
+        if binary and msgpack is None:
+            raise ImportError("msgpack is required for binary checkpoints; use checkpoint_json()")
+        if not self._ckpt_dir_ready:
+            os.makedirs(self._checkpoint_dir, exist_ok=True)
+            self._ckpt_dir_ready = True
+        packer = None
+        if binary:
+            # Single pop() rather than check-then-pop: another thread may
+            # take the last pooled packer in between.
+            try:
+                packer = self._bufpool.pop()
+            except IndexError:
+                packer = msgpack.Packer(autoreset=False, use_bin_type=True)
+        try:
+            stem, digest_len, ext, parts = self._encode_snapshot(label, packer)
+        except BaseException:
+            if packer is not None:
+                self._recycle_packer(packer, ())
+            raise
+        fut = _CKPT_WRITER.submit(_write_snapshot, self._checkpoint_dir, stem, digest_len, ext, parts)
+        self._pending.add(fut)
+        fut.add_done_callback(self._checkpoint_done)
+        if packer is not None:
+            fut.add_done_callback(lambda _: self._recycle_packer(packer, parts))
+        return fut
+
+    def _checkpoint_done(self, fut: Future) -> None:
+        self._pending.discard(fut)
+        exc = fut.exception()
+        if exc is not None and self._ckpt_error is None:
+            self._ckpt_error = exc
+
+    def _recycle_packer(self, packer: Any, parts: Sequence[bytes]) -> None:
+        for part in parts:
+            if isinstance(part, memoryview):
+                part.release()
+        try:
+            packer.reset()
+        except BufferError:
+            return  # a failed write's traceback still holds a view; let it go
+        self._bufpool.append(packer)
+
+    def _encode_snapshot(self, label: str, packer: Any) -> Tuple[str, int, str, Sequence[bytes]]:
+        """
+        Encode the snapshot for label, into packer (a pooled msgpack.Packer)
+        if given, else as JSON. Returns (file stem, digest chars in the file
+        name, extension, byte parts to write in order).
+        """
         payload = {
-            "did": self.soken.did,
-            "ddna_sha256": self.soken.ddna_sha256,
-            "policy": {
-                "non_fungible": self.soken.non_fungible,
-                "unique_identity": self.soken.unique_identity,
-                "transferable": self.soken.transferable,
-                "merge_policy": self.soken.merge_policy,
-            },
             "digital_organs": {k: {
                 "organ_id": v.organ_id,
                 "state_uri": v.state_uri,
@@ -108,17 +406,32 @@ class OAE:
                 "schema": v.schema,
                 "volatile": v.volatile,
             } for k, v in self.soken.digital_organs.items()},
-            "meta": self.soken.meta,
+            "meta": self.soken.meta_dict(),
             "oae_params": self.params.__dict__,
-            "ts": time.time(),
+            "ts": time.time_ns(),
             "label": label,
         }
-        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-        digest = sha256_hex(raw)
-        path = os.path.join(self._checkpoint_dir, f"{label}_{digest[:16]}.json")
-        with open(path, "wb") as f:
-            f.write(raw)
-        return path
+        static_fields, static_prefix = self._static_parts()
+        if packer is not None:
+            packer.pack({**static_fields, **payload})
+            parts = (packer.getbuffer(),)
+            ext = ".msgpack"
+        else:
+            dynamic = _dumps(payload)
+            parts = (static_prefix, memoryview(dynamic)[1:])
+            ext = ".json"
+        return label, 16, ext, parts
+
+    def flush_checkpoints(self) -> None:
+        """
+        Block until every checkpoint_async() write issued so far has landed.
+        Re-raises the first write error since the last flush, if any, including
+        writes that had already failed before this call.
+        """
+        wait(tuple(self._pending))
+        exc, self._ckpt_error = self._ckpt_error, None
+        if exc is not None:
+            raise exc
 
     @staticmethod
     def verify_integrity(snapshot_bytes: bytes) -> str:
@@ -127,15 +440,33 @@ class OAE:
         """
         return sha256_hex(snapshot_bytes)
 
+    @staticmethod
+    def verify_integrity_batch(snapshots: Sequence[bytes]) -> List[str]:
+        """
+        Hash many snapshot payloads. Returns sha256 hex digests in input order.
+        """
+        if len(snapshots) < _HASH_BATCH_MIN or sum(map(len, snapshots)) < _HASH_BATCH_MIN_BYTES:
+            return [sha256_hex(b) for b in snapshots]
+        return list(_HASH_POOL.map(sha256_hex, snapshots))
+
+    @staticmethod
+    def checkpoint_batch(engines: Sequence["OAE"], label: str) -> List[str]:
+        """
+        Checkpoint many engines under one label, overlapping their writes.
+        Returns checkpoint file paths in input order.
+        """
+        futures = [e.checkpoint_async(label) for e in engines]
+        return [e._checkpoint_result(f) for e, f in zip(engines, futures)]
+
 if __name__ == "__main__":
     s = Soken(
         did="did:mitas:example",
-        ddna_sha256="abc123...",
+        ddna_sha256=sha256_digest(b"example-ddna"),
         digital_organs={
             "memory": DigitalOrgan(organ_id="memory", schema="episodic_v1", volatile=False),
             "emotion": DigitalOrgan(organ_id="emotion", schema="affect_v1", volatile=True),
         },
-        meta={"affect_level": 0.7, "checkpoint_dir": "./ckpt"},
+        meta=SokenMeta(affect_level=0.7, checkpoint_dir="./ckpt"),
     )
 
     limbs_organs = {  
@@ -1,95 +1,87 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
-import hashlib
-import json
+from dataclasses import dataclass
+from typing import Dict, Any, Sequence, Tuple
 import time
-import os
 import random
 
-def sha256_hex(data: str | bytes) -> str:
-    if isinstance(data, str):
-        data = data.encode('utf-8')
-    return hashlib.sha256(data).hexdigest()
+import core
+from core import (
+    CHECKPOINT_FORMAT,
+    DigitalOrgan,
+    ResonanceContext,
+    Soken,
+    _dumps,
+    sha256_digest,
+    sha256_hex,
+)
 
 def generate_mock_world_id() -> str:
     return f"0x{sha256_hex(str(time.time_ns()))[:16]}"
 
 @dataclass
-class OAEParams:
-    memory_decay: float = 0.10      
-    entropy_guard: float = 0.85     
-    learn_rate: float = 0.05        
-    recovery_rate: float = 0.20     
-
-@dataclass
-class DigitalOrgan:
-    organ_id: str
-    schema: str                     
-    volatile: bool = False          
-    
-    properties: Dict[str, float] = field(default_factory=lambda: {
-        "strength": 10.0,
-        "fatigue": 0.0,
-        "integrity": 100.0
-    })
-
-@dataclass
-class Soken:
-    """Container ที่ผูกกับ Identity"""
-    did: str                        
-    ddna_sha256: str                
-    digital_organs: Dict[str, DigitalOrgan] = field(default_factory=dict)
-    meta: Dict[str, Any] = field(default_factory=dict)
-
-class OAE:
+class OAEParams(core.OAEParams):
+    """ค่า default ของ OAE ฝั่งนี้ (decay ช้า, guard สูง) ต่างจาก core.OAEParams"""
+    memory_decay: float = 0.10
+    entropy_guard: float = 0.85
+    learn_rate: float = 0.05
+    recovery_rate: float = 0.20
+
+class OAE(core.OAE):
     """
     Organ Adjustment Engine: ควบคุมสมดุล, การเติบโต, และความเสื่อมถอย
+    checkpoint/flush/verify สืบทอดมาจาก core.OAE
     """
     def __init__(self, soken: Soken, params: OAEParams):
-        self.soken = soken
-        self.params = params
-        self._ckpt_dir = "./oae_checkpoints"
+        super().__init__(soken, params)
+        self._checkpoint_dir = self.soken.meta.checkpoint_dir or "./oae_checkpoints"
 
-    def resonance(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def resonance(self, context: ResonanceContext | Dict[str, Any]) -> Dict[str, Any]:
         """
         [Active Phase]
         context: { "organ_id": "arm_right", "intensity": 0.8, "action": "lift" }
+                 หรือ ResonanceContext(organ_id="arm_right", intensity=0.8, action="lift")
         """
-        target_id = context.get("organ_id")
-        intensity = float(context.get("intensity", 0.5))
+        if isinstance(context, ResonanceContext):
+            target_id = context.organ_id
+            intensity = context.intensity
+        else:
+            target_id = context.get("organ_id")
+            intensity = float(context.get("intensity", 0.5))
         
         report = {"status": "ignored", "impact": 0.0}
 
-        if target_id and target_id in self.soken.digital_organs:
-            organ = self.soken.digital_organs[target_id]
-            
-            effective_impact = intensity * (1.0 - (self.params.entropy_guard * 0.3))
-            
-            if "motor" in organ.schema: 
-                current_str = organ.properties.get("strength", 10.0)
-                gain = effective_impact * self.params.learn_rate
-                organ.properties["strength"] = min(100.0, current_str + gain)
-                
-                current_fatigue = organ.properties.get("fatigue", 0.0)
-                fatigue_spike = intensity * 10.0  
-                organ.properties["fatigue"] = min(100.0, current_fatigue + fatigue_spike)
-                
-                report = {
-                    "organ": target_id,
-                    "strength_gain": f"+{gain:.4f}",
-                    "new_strength": organ.properties["strength"],
-                    "fatigue_spike": f"+{fatigue_spike:.2f}"
-                }
-
-            elif "cognitive" in organ.schema: 
-                pass
-
-            self.soken.meta["last_active_organ"] = target_id
-            self.soken.meta["last_active_ts"] = time.time()
+        organ = self.soken.digital_organs.get(target_id) if target_id else None
+        if organ is not None:
+            report = self._RESONATORS[organ.schema_kind](self, target_id, organ, intensity) or report
+
+            meta = self.soken.meta
+            meta.last_active_organ = target_id
+            meta.last_active_ts = time.time_ns()
 
         return report
 
+    def _resonate_motor(self, target_id: str, organ: DigitalOrgan, intensity: float) -> Dict[str, Any]:
+        effective_impact = intensity * (1.0 - (self.params.entropy_guard * 0.3))
+        
+        gain = effective_impact * self.params.learn_rate
+        organ.strength = min(100.0, organ.strength + gain)
+        
+        fatigue_spike = intensity * 10.0  
+        organ.fatigue = min(100.0, organ.fatigue + fatigue_spike)
+        
+        return {
+            "organ": target_id,
+            "strength_gain": f"+{gain:.4f}",
+            "new_strength": organ.strength,
+            "fatigue_spike": f"+{fatigue_spike:.2f}"
+        }
+
+    def _resonate_passive(self, target_id: str, organ: DigitalOrgan, intensity: float) -> None:
+        return None
+
+    # Jump table indexed by SchemaKind
+    _RESONATORS = (_resonate_passive, _resonate_motor, _resonate_passive)
+
     def decay_tick(self) -> Dict[str, Any]:
         """
         [Passive Phase] ทำงานตามเวลา (Recovery & Atrophy)
@@ -97,46 +89,48 @@ class OAE:
         recovered = []
         atrophied = []
 
+        recovery_rate = self.params.recovery_rate
+        decay_frac = self.params.memory_decay * 0.01
+
         for oid, organ in self.soken.digital_organs.items():
-            props = organ.properties
+            fatigue = organ.fatigue
             
-            if props.get("fatigue", 0) > 0:
-                loss = props["fatigue"] * self.params.recovery_rate
-                props["fatigue"] = max(0.0, props["fatigue"] - loss)
+            if fatigue > 0:
+                loss = fatigue * recovery_rate
+                fatigue = organ.fatigue = max(0.0, fatigue - loss)
                 recovered.append(f"{oid} (fatigue -{loss:.2f})")
 
-            if props.get("strength", 0) > 10.0 and props.get("fatigue", 0) < 1.0:
-                decay_amt = props["strength"] * (self.params.memory_decay * 0.01)
-                props["strength"] -= decay_amt
+            strength = organ.strength
+            if strength > 10.0 and fatigue < 1.0:
+                decay_amt = strength * decay_frac
+                organ.strength = strength - decay_amt
                 atrophied.append(f"{oid} (str -{decay_amt:.4f})")
 
         return {"recovered": recovered, "atrophied": atrophied}
 
-    def checkpoint(self, label: str) -> str:
-        """Snapshot"""
-        os.makedirs(self._ckpt_dir, exist_ok=True)
-        
+    def _encode_snapshot(self, label: str, packer: Any) -> Tuple[str, int, str, Sequence[bytes]]:
         snapshot = {
+            "format": CHECKPOINT_FORMAT,
             "did": self.soken.did,
-            "timestamp": time.time(),
+            "timestamp": time.time_ns(),
             "label": label,
             "organs": {
                 k: {
                     "id": v.organ_id,
-                    "props": v.properties
+                    "props": dict(v.properties)
                 } for k, v in self.soken.digital_organs.items()
             }
         }
         
-        data_bytes = json.dumps(snapshot, indent=2).encode('utf-8')
-        file_hash = sha256_hex(data_bytes)[:12]
-        filename = f"{self.soken.did.split(':')[-1]}_{label}_{file_hash}.json"
-        path = os.path.join(self._ckpt_dir, filename)
-        
-        with open(path, "wb") as f:
-            f.write(data_bytes)
-            
-        return path
+        if packer is not None:
+            packer.pack(snapshot)
+            data_bytes = packer.getbuffer()
+            ext = ".msgpack"
+        else:
+            data_bytes = _dumps(snapshot)
+            ext = ".json"
+        stem = f"{self.soken.did.split(':')[-1]}_{label}"
+        return stem, 12, ext, (data_bytes,)
 
 def run_simulation():
     print("--- 🟢 INITIALIZING OAE SYSTEM ---")
@@ -153,7 +147,7 @@ def run_simulation():
     
     my_soken = Soken(
         did=user_did,
-        ddna_sha256=sha256_hex("unique_biometric_seed"),
+        ddna_sha256=sha256_digest("unique_biometric_seed"),
         digital_organs=limbs
     )
 
@@ -188,8 +182,8 @@ def run_simulation():
         time.sleep(0.5)
 
     print("\n--- 📊 FINAL STATUS ---")
-    r_arm = my_soken.digital_organs["arm_right"].properties
-    print(f"Right Arm -> Strength: {r_arm['strength']:.2f}, Fatigue: {r_arm['fatigue']:.2f}")
+    r_arm = my_soken.digital_organs["arm_right"]
+    print(f"Right Arm -> Strength: {r_arm.strength:.2f}, Fatigue: {r_arm.fatigue:.2f}")
 
 if __name__ == "__main__":
     run_simulation()
\ No newline at end of file